@@ -7,12 +7,25 @@
 
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
-import traceback
 import signal
+import platform
+import importlib.util
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import psutil
+except ImportError:  # psutil 為可選套件
+    psutil = None
+
+# 目前行程的 psutil 控制代碼，只建立一次
+_PROCESS = psutil.Process() if psutil else None
+
 # 載入 .env 檔案
 def load_env_file():
     """載入 .env 檔案中的環境變數"""
@@ -29,15 +42,18 @@ def load_env_file():
         # 如果沒有 python-dotenv，使用手動解析
         env_file = Path(__file__).parent / '.env'
         if env_file.exists():
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip().strip('"').strip("'")
-                        if key and value:
-                            os.environ[key] = value
+            # 一次讀入整個檔案，解析後批次寫入環境變數
+            pairs = {}
+            for line in env_file.read_text(encoding='utf-8').splitlines():
+                line = line.strip()
+                if not line or line[0] == '#' or '=' not in line:
+                    continue
+                key, _, value = line.partition('=')
+                key = key.strip()
+                value = value.strip().strip('"').strip("'")
+                if key and value:
+                    pairs[key] = value
+            os.environ.update(pairs)
             print(f"✅ 已載入 .env 檔案 (手動): {env_file}")
         else:
             print(f"⚠️ 找不到 .env 檔案: {env_file}")
@@ -45,8 +61,10 @@ def load_env_file():
 # 立即載入環境變數
 load_env_file()
 
-# 確保能找到 src 模組
-sys.path.insert(0, str(Path(__file__).parent))
+# 確保能找到 src 模組（直接執行時此目錄已是 sys.path[0]，不重複加入）
+_project_root = str(Path(__file__).resolve().parent)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
 
 # 設定完整的日誌配置
 def setup_logging():
@@ -55,6 +73,12 @@ def setup_logging():
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
+    # 格式中未使用執行緒、行程與原始碼位置，略過每筆紀錄的這些查詢
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+    
     # 設定日誌格式
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -73,201 +97,247 @@ def setup_logging():
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # 檔案處理器
-    log_file = log_dir / f"process_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    log_file = log_dir / f"process_{time.strftime('%Y%m%d_%H%M%S')}.log"
     file_handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    
+    # 佇列處理器：主流程只負責入列，實際寫入由背景執行緒完成
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # 創建主日誌器
     logger = logging.getLogger(__name__)
-    logger.info(f"📝 日誌系統初始化完成 - 日誌檔案: {log_file}")
+    logger.info("📝 日誌系統初始化完成 - 日誌檔案: %s", log_file)
     
     return logger
 
 # 初始化日誌
 logger = setup_logging()
 
+# 信號名稱對照（模組層級，處理器內不再建立）
+_SIG_NAMES = {signal.SIGINT: 'SIGINT', signal.SIGTERM: 'SIGTERM'}
+
 def signal_handler(signum, frame):
     """處理系統信號（如 Ctrl+C）"""
-    signal_names = {signal.SIGINT: 'SIGINT', signal.SIGTERM: 'SIGTERM'}
-    signal_name = signal_names.get(signum, f'Signal {signum}')
-    logger.warning(f"⚠️ 收到信號 {signal_name}，正在安全關閉程式...")
+    signal_name = _SIG_NAMES.get(signum, f'Signal {signum}')
+    logger.warning("⚠️ 收到信號 %s，正在安全關閉程式...", signal_name)
     sys.exit(130)
 
-def validate_environment() -> tuple[bool, list[str], list[str]]:
+# 橫幅分隔線
+_BAR = "=" * 60
+_WIDE_BAR = "=" * 80
+
+# 需要遮蔽顯示的敏感環境變數
+_SENSITIVE_VARS = frozenset({
+    'OPENAI_API_KEY',
+    'NOTION_API_KEY',
+    'R2_ACCESS_KEY',
+    'R2_SECRET_KEY',
+})
+
+# 視為「開啟」的布林環境變數值
+_TRUTHY_VALUES = frozenset({'1', 'true', 'yes', 'on'})
+
+def _env_flag(value: str | None) -> bool:
+    """將布林環境變數解析為 bool（0 / false / 空值皆為關閉）"""
+    return bool(value) and value.strip().lower() in _TRUTHY_VALUES
+
+def _mask(value: str) -> str:
+    """遮蔽敏感值，只保留最後 4 個字元"""
+    return f"***...{value[-4:]}" if len(value) > 4 else "***"
+
+# 環境變數驗證清單，每項為 (變數名稱, 說明)
+
+# 核心必要變數
+_CORE_REQUIRED_VARS = (
+    ('NOTION_PAGE_ID', 'Notion 頁面 ID（用於更新特定頁面）'),
+    ('TASK_NAME', '任務名稱'),
+    ('PERSON_IN_CHARGE', '負責人'),
+    ('VIDEOGRAPHER', '攝影師'),
+    ('ORIGINAL_LINK', '原始影片連結'),
+    ('OPENAI_API_KEY', 'OpenAI API 金鑰'),
+)
+
+# Notion 整合配置
+_NOTION_VARS = (
+    ('NOTION_API_KEY', 'Notion API 金鑰'),
+    ('NOTION_DATABASE_ID', 'Notion 資料庫 ID'),
+)
+
+# R2 雲端儲存配置，每項為 (變數名稱, 說明, 是否必要)
+_R2_VARS = (
+    ('R2_ACCOUNT_ID', 'R2 帳戶 ID', True),
+    ('R2_ACCESS_KEY', 'R2 存取金鑰', True),
+    ('R2_SECRET_KEY', 'R2 秘密金鑰', True),
+    ('R2_BUCKET', 'R2 儲存桶名稱', True),
+    ('R2_CUSTOM_DOMAIN', 'R2 自定義域名（可選）', False),
+)
+
+# 可選進階配置
+_OPTIONAL_VARS = (
+    ('OPENAI_MODEL', 'OpenAI 模型（預設: gpt-4o-mini）'),
+    ('MAX_VIDEO_SIZE_MB', '最大影片大小限制（預設: 500MB）'),
+    ('PROCESSING_TIMEOUT', '處理超時時間（預設: 300秒）'),
+)
+
+# 處理結果中需要顯示的欄位，順序對應 main() 的解構
+_RESULT_KEYS = (
+    'status', 'task_id', 'processed_video_url', 'processed_thumbnail_url',
+    'ai_content_summary', 'ai_title_suggestions', 'ai_tag_suggestions', 'error_message',
+)
+
+def validate_environment(env: dict[str, str], fast_fail: bool = False) -> tuple[bool, list[str], list[str]]:
     """
     完整的環境變數驗證
+    env: 啟動時擷取的環境變數快照
+    fast_fail: 核心變數有缺少時即停止，不再檢查其餘區塊（CI 使用），否則輸出完整診斷
     返回: (是否有效, 錯誤清單, 警告清單)
     """
-    logger.info("🔍 開始環境變數驗證...")
-    
     errors = []
     warnings = []
     
-    # === 核心必要變數 ===
-    core_required = {
-        'NOTION_PAGE_ID': 'Notion 頁面 ID（用於更新特定頁面）',
-        'TASK_NAME': '任務名稱',
-        'PERSON_IN_CHARGE': '負責人',
-        'VIDEOGRAPHER': '攝影師',
-        'ORIGINAL_LINK': '原始影片連結',
-        'OPENAI_API_KEY': 'OpenAI API 金鑰'
-    }
+    # 檢查明細先累積在 lines，最後一次輸出
+    lines = ["🔍 開始環境變數驗證..."]
     
-    logger.info("檢查核心必要變數：")
-    for var, desc in core_required.items():
-        value = os.environ.get(var)
+    # === 核心必要變數 ===
+    lines.append("檢查核心必要變數：")
+    for var, desc in _CORE_REQUIRED_VARS:
+        value = env.get(var)
         if not value:
             errors.append(f"❌ 缺少必要變數 {var} ({desc})")
-            logger.error(f"❌ {var}: 未設置")
+            lines.append(f"❌ {var}: 未設置")
         else:
             # 隱藏敏感資訊
-            if "KEY" in var or "SECRET" in var:
-                display_value = f"***...{value[-4:]}" if len(value) > 4 else "***"
-            else:
-                display_value = value
-            logger.info(f"✅ {var}: {display_value}")
+            display_value = _mask(value) if var in _SENSITIVE_VARS else value
+            lines.append(f"✅ {var}: {display_value}")
     
-    # === Notion 整合配置 ===
-    notion_vars = {
-        'NOTION_API_KEY': 'Notion API 金鑰',
-        'NOTION_DATABASE_ID': 'Notion 資料庫 ID'
-    }
+    # 快速失敗：核心變數檢查完畢後若有錯誤，略過其餘檢查（錯誤仍一次列出）
+    if fast_fail and errors:
+        lines.append("⏹️ 快速失敗模式，核心變數不完整，略過其餘檢查")
+        logger.info("\n".join(lines))
+        return False, errors, warnings
     
+    # === Notion 整合配置 ===
     notion_configured = True
-    logger.info("檢查 Notion 整合配置：")
-    for var, desc in notion_vars.items():
-        value = os.environ.get(var)
+    lines.append("檢查 Notion 整合配置：")
+    for var, desc in _NOTION_VARS:
+        value = env.get(var)
         if not value:
             notion_configured = False
             warnings.append(f"⚠️ Notion 變數 {var} 未設置 ({desc})")
-            logger.warning(f"⚠️ {var}: 未設置")
+            lines.append(f"⚠️ {var}: 未設置")
         else:
-            display_value = f"***...{value[-4:]}" if "KEY" in var and len(value) > 4 else value
-            logger.info(f"✅ {var}: {display_value}")
+            display_value = _mask(value) if var in _SENSITIVE_VARS else value
+            lines.append(f"✅ {var}: {display_value}")
     
     if not notion_configured:
         warnings.append("⚠️ Notion 整合將被停用")
-        logger.warning("⚠️ Notion 整合配置不完整，相關功能將被停用")
+        lines.append("⚠️ Notion 整合配置不完整，相關功能將被停用")
     
     # === R2 雲端儲存配置 ===
-    r2_vars = {
-        'R2_ACCOUNT_ID': 'R2 帳戶 ID',
-        'R2_ACCESS_KEY': 'R2 存取金鑰',
-        'R2_SECRET_KEY': 'R2 秘密金鑰',
-        'R2_BUCKET': 'R2 儲存桶名稱',
-        'R2_CUSTOM_DOMAIN': 'R2 自定義域名（可選）'
-    }
-    
     r2_configured = True
-    logger.info("檢查 R2 雲端儲存配置：")
-    for var, desc in r2_vars.items():
-        value = os.environ.get(var)
-        is_required = var != 'R2_CUSTOM_DOMAIN'
-        
+    lines.append("檢查 R2 雲端儲存配置：")
+    for var, desc, is_required in _R2_VARS:
+        value = env.get(var)
         if not value:
             if is_required:
                 r2_configured = False
                 warnings.append(f"⚠️ R2 變數 {var} 未設置 ({desc})")
-                logger.warning(f"⚠️ {var}: 未設置")
+                lines.append(f"⚠️ {var}: 未設置")
             else:
-                logger.info(f"ℹ️ {var}: 未設置（可選）")
+                lines.append(f"ℹ️ {var}: 未設置（可選）")
         else:
-            if "KEY" in var:
-                display_value = f"***...{value[-4:]}" if len(value) > 4 else "***"
-            else:
-                display_value = value
-            logger.info(f"✅ {var}: {display_value}")
+            display_value = _mask(value) if var in _SENSITIVE_VARS else value
+            lines.append(f"✅ {var}: {display_value}")
     
     if not r2_configured:
         warnings.append("⚠️ R2 雲端儲存將被停用，檔案將保存在本地")
-        logger.warning("⚠️ R2 雲端儲存配置不完整，檔案將保存在本地")
+        lines.append("⚠️ R2 雲端儲存配置不完整，檔案將保存在本地")
     
     # === 可選進階配置 ===
-    optional_vars = {
-        'OPENAI_MODEL': 'OpenAI 模型（預設: gpt-4o-mini）',
-        'MAX_VIDEO_SIZE_MB': '最大影片大小限制（預設: 500MB）',
-        'PROCESSING_TIMEOUT': '處理超時時間（預設: 300秒）'
-    }
-    
-    logger.info("檢查可選配置：")
-    for var, desc in optional_vars.items():
-        value = os.environ.get(var)
+    lines.append("檢查可選配置：")
+    for var, desc in _OPTIONAL_VARS:
+        value = env.get(var)
         if value:
-            logger.info(f"✅ {var}: {value}")
+            lines.append(f"✅ {var}: {value}")
         else:
-            logger.info(f"ℹ️ {var}: 使用預設值 ({desc})")
+            lines.append(f"ℹ️ {var}: 使用預設值 ({desc})")
     
     # === 驗證 URL 格式 ===
-    original_link = os.environ.get('ORIGINAL_LINK')
+    original_link = env.get('ORIGINAL_LINK')
     if original_link and not original_link.startswith(('http://', 'https://')):
         errors.append("❌ ORIGINAL_LINK 格式不正確，必須以 http:// 或 https:// 開頭")
-        logger.error("❌ ORIGINAL_LINK 格式不正確")
+        lines.append("❌ ORIGINAL_LINK 格式不正確")
+    
+    logger.info("\n".join(lines))
     
     # === 總結驗證結果 ===
     is_valid = len(errors) == 0
     
-    logger.info("="*60)
-    logger.info("📋 環境驗證總結")
-    logger.info("="*60)
-    logger.info(f"✅ 核心配置: {'完整' if not errors else '不完整'}")
-    logger.info(f"🔧 Notion 整合: {'啟用' if notion_configured else '停用'}")
-    logger.info(f"☁️ R2 雲端儲存: {'啟用' if r2_configured else '停用'}")
-    logger.info(f"📊 驗證結果: {'通過' if is_valid else '失敗'}")
-    
+    summary = [
+        _BAR,
+        "📋 環境驗證總結",
+        _BAR,
+        f"✅ 核心配置: {'完整' if not errors else '不完整'}",
+        f"🔧 Notion 整合: {'啟用' if notion_configured else '停用'}",
+        f"☁️ R2 雲端儲存: {'啟用' if r2_configured else '停用'}",
+        f"📊 驗證結果: {'通過' if is_valid else '失敗'}",
+    ]
     if errors:
-        logger.info(f"❌ 錯誤數量: {len(errors)}")
+        summary.append(f"❌ 錯誤數量: {len(errors)}")
     if warnings:
-        logger.info(f"⚠️ 警告數量: {len(warnings)}")
+        summary.append(f"⚠️ 警告數量: {len(warnings)}")
+    summary.append(_BAR)
     
-    logger.info("="*60)
+    logger.info("\n".join(summary))
     
     return is_valid, errors, warnings
 
-def print_system_info():
+def print_system_info(start_time: datetime):
     """顯示系統資訊"""
-    logger.info("="*60)
-    logger.info("🖥️ 系統資訊")
-    logger.info("="*60)
+    lines = [_BAR, "🖥️ 系統資訊", _BAR]
     
     # Python 版本
     python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
-    logger.info(f"🐍 Python 版本: {python_version}")
+    lines.append(f"🐍 Python 版本: {python_version}")
     
     # 平台資訊
-    import platform
-    logger.info(f"💻 作業系統: {platform.system()} {platform.release()}")
-    logger.info(f"🏗️ 架構: {platform.machine()}")
+    lines.append(f"💻 作業系統: {platform.system()} {platform.release()}")
+    lines.append(f"🏗️ 架構: {platform.machine()}")
     
     # 記憶體資訊（如果可用）
-    try:
-        import psutil
+    if psutil is not None:
         memory = psutil.virtual_memory()
-        logger.info(f"💾 可用記憶體: {memory.available / (1024**3):.1f} GB / {memory.total / (1024**3):.1f} GB")
-    except ImportError:
-        logger.info("💾 記憶體資訊: 無法取得（未安裝 psutil）")
+        lines.append(f"💾 可用記憶體: {memory.available / (1024**3):.1f} GB / {memory.total / (1024**3):.1f} GB")
+    else:
+        lines.append("💾 記憶體資訊: 無法取得（未安裝 psutil）")
     
     # 工作目錄
-    logger.info(f"📁 工作目錄: {os.getcwd()}")
-    logger.info(f"🗓️ 啟動時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append(f"📁 工作目錄: {os.getcwd()}")
+    lines.append(f"🗓️ 啟動時間: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    logger.info("="*60)
+    lines.append(_BAR)
+    logger.info("\n".join(lines))
 
-def print_task_summary():
+def print_task_summary(env: dict[str, str]):
     """顯示任務摘要"""
-    logger.info("="*60)
-    logger.info("📋 任務摘要")
-    logger.info("="*60)
-    logger.info(f"🎬 任務名稱: {os.environ.get('TASK_NAME', 'N/A')}")
-    logger.info(f"🔗 影片連結: {os.environ.get('ORIGINAL_LINK', 'N/A')}")
-    logger.info(f"👤 負責人: {os.environ.get('PERSON_IN_CHARGE', 'N/A')}")
-    logger.info(f"📸 攝影師: {os.environ.get('VIDEOGRAPHER', 'N/A')}")
-    logger.info(f"📄 Notion 頁面: {os.environ.get('NOTION_PAGE_ID', 'N/A')}")
-    logger.info("="*60)
+    logger.info("\n".join([
+        _BAR,
+        "📋 任務摘要",
+        _BAR,
+        f"🎬 任務名稱: {env.get('TASK_NAME', 'N/A')}",
+        f"🔗 影片連結: {env.get('ORIGINAL_LINK', 'N/A')}",
+        f"👤 負責人: {env.get('PERSON_IN_CHARGE', 'N/A')}",
+        f"📸 攝影師: {env.get('VIDEOGRAPHER', 'N/A')}",
+        f"📄 Notion 頁面: {env.get('NOTION_PAGE_ID', 'N/A')}",
+        _BAR,
+    ]))
 
 def check_dependencies():
     """檢查關鍵相依套件"""
@@ -282,22 +352,117 @@ def check_dependencies():
     
     missing_packages = []
     
+    # 只查找模組是否存在，不執行模組本身（實際載入留給處理器）
     for package, description in required_packages.items():
-        try:
-            __import__(package)
-            logger.info(f"✅ {package}: 已安裝 ({description})")
-        except ImportError:
+        if importlib.util.find_spec(package) is not None:
+            logger.info("✅ %s: 已安裝 (%s)", package, description)
+        else:
             missing_packages.append(f"{package} ({description})")
-            logger.error(f"❌ {package}: 未安裝")
+            logger.error("❌ %s: 未安裝", package)
     
     if missing_packages:
         logger.error("❌ 缺少必要套件，請執行: pip install -r requirements.txt")
-        logger.error(f"缺少套件: {', '.join(missing_packages)}")
+        logger.error("缺少套件: %s", ', '.join(missing_packages))
         return False
     
     logger.info("✅ 所有必要套件已安裝")
     return True
 
+def _emit_result(result: dict, duration: float) -> int:
+    """
+    輸出最終處理結果報告
+    duration: 程式總執行時間（秒）
+    返回: 對應處理狀態的退出碼
+    """
+    # 一次取出所有結果欄位
+    (processing_status, task_id, video_url, thumb_url,
+     summary, titles, tags, error_message) = map(result.get, _RESULT_KEYS)
+    processing_status = processing_status or 'Unknown'
+    task_id = task_id or 'N/A'
+    
+    # 結果報告先累積在 lines，依最嚴重的狀態一次輸出
+    lines = [
+        _WIDE_BAR,
+        "🎯 最終處理結果",
+        _WIDE_BAR,
+        f"⏱️ 總執行時間: {duration:.1f} 秒",
+        f"📄 任務 ID: {task_id}",
+        f"📊 處理狀態: {processing_status}",
+    ]
+    
+    # 根據狀態設定退出碼並顯示詳細結果
+    if processing_status == "完成":
+        level = logging.INFO
+        exit_code = 0
+        lines.append("🎉 影片處理完全成功！")
+        
+        # 顯示成功結果
+        if video_url:
+            label = "影片連結" if video_url.startswith('http') else "影片檔案"
+            lines.append(f"🎥 {label}: {video_url}")
+        
+        if thumb_url:
+            label = "縮圖連結" if thumb_url.startswith('http') else "縮圖檔案"
+            lines.append(f"🖼️ {label}: {thumb_url}")
+        
+        if summary:
+            lines.append(f"📝 AI 摘要: {summary[:100]}{'...' if len(summary) > 100 else ''}")
+        
+        if titles:
+            lines.append(f"💡 標題建議數量: {len(titles)}")
+            lines.extend(f"   {i}. {title}" for i, title in enumerate(titles[:3], 1))
+            if len(titles) > 3:
+                lines.append(f"   ... 等共 {len(titles)} 個標題")
+        
+        if tags:
+            lines.append(f"🏷️ 標籤建議: {' '.join(tags[:8])}")
+            if len(tags) > 8:
+                lines.append(f"   ... 等共 {len(tags)} 個標籤")
+        
+    elif processing_status == "部分完成":
+        level = logging.WARNING
+        exit_code = 2
+        lines.append("⚠️ 影片處理部分成功")
+        
+        if error_message:
+            lines.append(f"錯誤訊息: {error_message}")
+        
+        # 顯示成功的部分
+        if titles:
+            lines.append(f"✅ AI 內容生成成功 ({len(titles)} 個標題)")
+        if video_url:
+            lines.append("✅ 影片下載成功")
+        
+    elif processing_status == "失敗":
+        level = logging.ERROR
+        exit_code = 1
+        lines.append("❌ 影片處理失敗")
+        
+        if error_message:
+            lines.append(f"失敗原因: {error_message}")
+        
+    else:
+        level = logging.WARNING
+        exit_code = 3
+        lines.append(f"⚠️ 未知的處理狀態: {processing_status}")
+    
+    # 顯示系統使用統計（如果可用）
+    if _PROCESS is not None:
+        memory_info = _PROCESS.memory_info()
+        lines.append(f"📈 記憶體使用: {memory_info.rss / (1024**2):.1f} MB")
+        lines.append(f"⏱️ CPU 時間: {_PROCESS.cpu_times().user:.2f} 秒")
+    
+    lines.append(_WIDE_BAR)
+    
+    if exit_code == 0:
+        lines.append("🎊 影片自動化處理系統執行完畢")
+    else:
+        lines.append(f"⚠️ 系統執行完畢，退出碼: {exit_code}")
+    
+    logger.log(level, "\n".join(lines))
+    
+    return exit_code
+
 def main():
     """主程式入口"""
     # 設定信號處理器
@@ -305,33 +470,39 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     start_time = datetime.now()
-    exit_code = 0
+    start_mono = time.monotonic()
+    total_duration = None
     
     try:
         logger.info("🚀 啟動影片自動化處理系統 v2.2")
-        logger.info(f"⏰ 啟動時間: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("⏰ 啟動時間: %s", start_time.strftime('%Y-%m-%d %H:%M:%S'))
         
         # 1. 顯示系統資訊
-        print_system_info()
+        print_system_info(start_time)
         
         # 2. 檢查相依套件
         if not check_dependencies():
             logger.error("❌ 相依套件檢查失敗")
             return 1
         
-        # 3. 環境變數驗證
-        is_valid, errors, warnings = validate_environment()
+        # 3. 環境變數驗證（只擷取一次環境變數快照）
+        env = dict(os.environ)
+        # 核心變數有錯誤即停止驗證：明確設定 FAIL_FAST 時以其為準（FAIL_FAST=0 可在 CI 中關閉），
+        # 未設定時於 CI 中預設開啟
+        fail_fast_setting = env.get('FAIL_FAST', '').strip()
+        fast_fail = _env_flag(fail_fast_setting) if fail_fast_setting else _env_flag(env.get('CI'))
+        is_valid, errors, warnings = validate_environment(env, fast_fail=fast_fail)
         
         # 顯示所有錯誤和警告
         if errors:
             logger.error("❌ 環境配置錯誤:")
             for error in errors:
-                logger.error(f"   {error}")
+                logger.error("   %s", error)
         
         if warnings:
             logger.warning("⚠️ 環境配置警告:")
             for warning in warnings:
-                logger.warning(f"   {warning}")
+                logger.warning("   %s", warning)
         
         if not is_valid:
             logger.error("❌ 環境配置驗證失敗，程式終止")
@@ -339,7 +510,7 @@ def main():
             return 1
         
         # 4. 顯示任務資訊
-        print_task_summary()
+        print_task_summary(env)
         
         # 5. 導入和初始化處理器
         try:
@@ -347,12 +518,11 @@ def main():
             from src.notion_video_processor import NotionVideoProcessor
             logger.info("✅ NotionVideoProcessor 模組載入成功")
         except ImportError as e:
-            logger.error(f"❌ 無法載入 NotionVideoProcessor: {e}")
+            logger.error("❌ 無法載入 NotionVideoProcessor: %s", e)
             logger.error("請確認 src/notion_video_processor.py 檔案存在且語法正確")
             return 1
         except Exception as e:
-            logger.error(f"❌ 載入模組時發生錯誤: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("❌ 載入模組時發生錯誤: %s", e)
             return 1
         
         # 6. 執行處理流程
@@ -367,131 +537,28 @@ def main():
             logger.warning("⚠️ 使用者中斷程式執行")
             return 130
         except Exception as e:
-            logger.error(f"❌ 處理器執行失敗: {e}")
-            logger.error("完整錯誤堆疊:")
-            logger.error(traceback.format_exc())
+            logger.exception("❌ 處理器執行失敗: %s", e)
             return 1
         
-        # 7. 分析處理結果
-        processing_status = result.get('status', 'Unknown')
-        task_id = result.get('task_id', 'N/A')
-        error_message = result.get('error_message')
-        
-        # 計算總處理時間
-        end_time = datetime.now()
-        total_duration = (end_time - start_time).total_seconds()
-        
-        logger.info("="*80)
-        logger.info("🎯 最終處理結果")
-        logger.info("="*80)
-        logger.info(f"⏱️ 總執行時間: {total_duration:.1f} 秒")
-        logger.info(f"📄 任務 ID: {task_id}")
-        logger.info(f"📊 處理狀態: {processing_status}")
-        
-        # 根據狀態設定退出碼並顯示詳細結果
-        if processing_status == "完成":
-            logger.info("🎉 影片處理完全成功！")
-            exit_code = 0
-            
-            # 顯示成功結果
-            if result.get('processed_video_url'):
-                video_url = result['processed_video_url']
-                if video_url.startswith('http'):
-                    logger.info(f"🎥 影片連結: {video_url}")
-                else:
-                    logger.info(f"🎥 影片檔案: {video_url}")
-            
-            if result.get('processed_thumbnail_url'):
-                thumb_url = result['processed_thumbnail_url']
-                if thumb_url.startswith('http'):
-                    logger.info(f"🖼️ 縮圖連結: {thumb_url}")
-                else:
-                    logger.info(f"🖼️ 縮圖檔案: {thumb_url}")
-            
-            if result.get('ai_content_summary'):
-                summary = result['ai_content_summary']
-                logger.info(f"📝 AI 摘要: {summary[:100]}{'...' if len(summary) > 100 else ''}")
-            
-            if result.get('ai_title_suggestions'):
-                titles = result['ai_title_suggestions']
-                logger.info(f"💡 標題建議數量: {len(titles)}")
-                for i, title in enumerate(titles[:3], 1):
-                    logger.info(f"   {i}. {title}")
-                if len(titles) > 3:
-                    logger.info(f"   ... 等共 {len(titles)} 個標題")
-            
-            if result.get('ai_tag_suggestions'):
-                tags = result['ai_tag_suggestions'][:8]
-                logger.info(f"🏷️ 標籤建議: {' '.join(tags)}")
-                if len(result['ai_tag_suggestions']) > 8:
-                    logger.info(f"   ... 等共 {len(result['ai_tag_suggestions'])} 個標籤")
-            
-        elif processing_status == "部分完成":
-            logger.warning("⚠️ 影片處理部分成功")
-            exit_code = 2
-            
-            if error_message:
-                logger.warning(f"錯誤訊息: {error_message}")
-            
-            # 顯示成功的部分
-            if result.get('ai_title_suggestions'):
-                logger.info(f"✅ AI 內容生成成功 ({len(result['ai_title_suggestions'])} 個標題)")
-            if result.get('processed_video_url'):
-                logger.info("✅ 影片下載成功")
-            
-        elif processing_status == "失敗":
-            logger.error("❌ 影片處理失敗")
-            exit_code = 1
-            
-            if error_message:
-                logger.error(f"失敗原因: {error_message}")
-            
-        else:
-            logger.warning(f"⚠️ 未知的處理狀態: {processing_status}")
-            exit_code = 3
-        
-        # 顯示系統使用統計（如果可用）
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            logger.info(f"📈 記憶體使用: {memory_info.rss / (1024**2):.1f} MB")
-            logger.info(f"⏱️ CPU 時間: {process.cpu_times().user:.2f} 秒")
-        except ImportError:
-            pass
-        
-        logger.info("="*80)
-        
-        if exit_code == 0:
-            logger.info("🎊 影片自動化處理系統執行完畢")
-        else:
-            logger.warning(f"⚠️ 系統執行完畢，退出碼: {exit_code}")
-        
-        return exit_code
+        # 7. 分析處理結果（總執行時間只計算一次，finally 沿用）
+        total_duration = time.monotonic() - start_mono
+        return _emit_result(result, total_duration)
         
     except KeyboardInterrupt:
         logger.warning("⚠️ 使用者中斷程式執行")
         return 130
     
     except Exception as e:
-        logger.error(f"❌ 系統發生未預期錯誤: {e}")
-        logger.error(f"錯誤類型: {type(e).__name__}")
-        logger.error("完整錯誤堆疊:")
-        logger.error(traceback.format_exc())
+        logger.exception("❌ 系統發生未預期錯誤 (%s): %s", type(e).__name__, e)
         return 1
     
     finally:
-        # 計算並記錄總執行時間
-        end_time = datetime.now()
-        total_duration = (end_time - start_time).total_seconds()
-        logger.info(f"🕐 程式總執行時間: {total_duration:.2f} 秒")
+        # 提前結束時才在此計算總執行時間
+        if total_duration is None:
+            total_duration = time.monotonic() - start_mono
+        logger.info("🕐 程式總執行時間: %.2f 秒", total_duration)
 
 if __name__ == "__main__":
-    # 設定 Python 路徑
-    current_dir = Path(__file__).parent
-    if str(current_dir) not in sys.path:
-        sys.path.insert(0, str(current_dir))
-    
     # 執行主程式
     exit_code = main()
     sys.exit(exit_code)
\ No newline at end of file
@@ -4,6 +4,7 @@
 """
 
 import logging
+import importlib
 
 # 設定套件日誌
 logger = logging.getLogger(__name__)
@@ -13,44 +14,56 @@ __version__ = "2.1.0"
 __author__ = "Video Automation Team"
 __description__ = "影片自動化處理系統，整合 Notion、AI 分析和影片處理功能"
 
-# 主要模組匯入
-try:
+# 延遲載入的公開類別：名稱 -> (子模組, 屬性)
+# 匯入 src 或 src.config 時不會連帶載入 yt-dlp、boto3、openai 等重量級套件
+_LAZY_EXPORTS = {
     # 核心處理器（主要使用）
-    from .notion_video_processor import NotionVideoProcessor
+    'NotionVideoProcessor': ('.notion_video_processor', 'NotionVideoProcessor'),
     
     # 輔助模組（如果存在）
-    try:
-        from .config import Config
-    except ImportError:
-        logger.debug("Config 模組未找到，跳過載入")
-        Config = None
-    
-    try:
-        from .ai_analyzer import AIAnalyzer
-    except ImportError:
-        logger.debug("AIAnalyzer 模組未找到，跳過載入")
-        AIAnalyzer = None
-    
-    # 向後相容性別名
-    NotionHandler = NotionVideoProcessor
-    VideoProcessor = NotionVideoProcessor  # 統一使用 NotionVideoProcessor
-    
-    logger.info(f"✅ 影片自動化處理套件 v{__version__} 載入成功")
-    
-except ImportError as e:
-    logger.warning(f"⚠️ 部分模組載入失敗：{e}")
-    logger.warning("請確認所有相依套件已正確安裝")
-    
-    # 創建替代類別以防止程式崩潰
+    'Config': ('.config', 'Config'),
+    'AIAnalyzer': ('.ai_analyzer', 'AIAnalyzer'),
+}
+
+# 向後相容性別名
+_ALIASES = {
+    'NotionHandler': 'NotionVideoProcessor',
+    'VideoProcessor': 'NotionVideoProcessor',  # 統一使用 NotionVideoProcessor
+}
+
+def _unavailable_processor(error):
+    """建立替代類別以防止程式在匯入階段崩潰"""
     class NotionVideoProcessor:
         def __init__(self):
             logger.error("❌ NotionVideoProcessor 模組載入失敗")
-            raise ImportError("無法載入 NotionVideoProcessor")
+            raise ImportError("無法載入 NotionVideoProcessor") from error
     
-    NotionHandler = NotionVideoProcessor
-    VideoProcessor = NotionVideoProcessor
-    Config = None
-    AIAnalyzer = None
+    return NotionVideoProcessor
+
+def __getattr__(name):
+    """首次存取公開類別時才匯入對應模組 (PEP 562)"""
+    target = _ALIASES.get(name, name)
+    if target not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, attr = _LAZY_EXPORTS[target]
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    except ImportError as e:
+        if target == 'NotionVideoProcessor':
+            logger.warning(f"⚠️ 部分模組載入失敗：{e}")
+            logger.warning("請確認所有相依套件已正確安裝")
+            value = _unavailable_processor(e)
+        else:
+            logger.debug(f"{target} 模組未找到，跳過載入")
+            value = None
+    
+    # 快取結果（含別名），之後的存取不再經過 __getattr__
+    globals()[target] = value
+    for alias, alias_target in _ALIASES.items():
+        if alias_target == target:
+            globals()[alias] = value
+    return value
 
 # 匯出的公開介面
 __all__ = [
@@ -67,7 +67,7 @@ class AIAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"❌ AI 分析失敗: {str(e)}")
+            logger.error("❌ AI 分析失敗: %s", e)
             return self._get_default_content()
     
     def _get_default_content(self) -> Dict:
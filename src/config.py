@@ -103,10 +103,10 @@ class Config:
             numeric_level = getattr(logging, self.processing.log_level.upper(), logging.INFO)
             logging.getLogger().setLevel(numeric_level)
             
-            logger.info(f"✅ 日誌配置完成 - 級別: {self.processing.log_level}")
+            logger.info("✅ 日誌配置完成 - 級別: %s", self.processing.log_level)
             
         except Exception as e:
-            logger.warning(f"⚠️ 日誌配置失敗：{e}")
+            logger.warning("⚠️ 日誌配置失敗：%s", e)
     
     def _validate_all_configs(self):
         """驗證所有配置"""
@@ -121,9 +121,8 @@ class Config:
         
         # 記錄驗證結果
         if all_errors:
-            logger.warning("⚠️ 配置驗證發現問題：")
-            for error in all_errors:
-                logger.warning(f"   - {error}")
+            logger.warning("⚠️ 配置驗證發現問題：\n%s",
+                           "\n".join(f"   - {error}" for error in all_errors))
         else:
             logger.info("✅ 所有配置驗證通過")
         
@@ -151,32 +150,35 @@ class Config:
     
     def print_config_summary(self):
         """列印配置摘要"""
-        logger.info("="*50)
-        logger.info("📋 配置摘要")
-        logger.info("="*50)
-        
-        # Notion 配置
-        logger.info("🔧 Notion 配置：")
-        logger.info(f"   - API Key: {'已設置' if self.notion.api_key else '未設置'}")
-        logger.info(f"   - Database ID: {'已設置' if self.notion.database_id else '未設置'}")
-        logger.info(f"   - Page ID: {self.notion.page_id or '未設置'}")
-        logger.info(f"   - 重試次數: {self.notion.max_retries}")
-        
-        # 任務配置
-        logger.info("📋 任務配置：")
-        logger.info(f"   - 任務名稱: {self.task.task_name}")
-        logger.info(f"   - 影片連結: {'已設置' if self.task.video_url else '未設置'}")
-        logger.info(f"   - 負責人: {self.task.assignee or '未設置'}")
-        logger.info(f"   - 攝影師: {self.task.photographer or '未設置'}")
-        
-        # 處理配置
-        logger.info("⚙️ 處理配置：")
-        logger.info(f"   - 日誌級別: {self.processing.log_level}")
-        logger.info(f"   - 並發任務數: {self.processing.max_concurrent_tasks}")
-        logger.info(f"   - 超時時間: {self.processing.timeout_seconds}秒")
-        logger.info(f"   - AI 最大 Token: {self.processing.ai_max_tokens}")
-        
-        logger.info("="*50)
+        # 摘要先組成單一字串，一次輸出
+        logger.info("\n".join([
+            "="*50,
+            "📋 配置摘要",
+            "="*50,
+            
+            # Notion 配置
+            "🔧 Notion 配置：",
+            f"   - API Key: {'已設置' if self.notion.api_key else '未設置'}",
+            f"   - Database ID: {'已設置' if self.notion.database_id else '未設置'}",
+            f"   - Page ID: {self.notion.page_id or '未設置'}",
+            f"   - 重試次數: {self.notion.max_retries}",
+            
+            # 任務配置
+            "📋 任務配置：",
+            f"   - 任務名稱: {self.task.task_name}",
+            f"   - 影片連結: {'已設置' if self.task.video_url else '未設置'}",
+            f"   - 負責人: {self.task.assignee or '未設置'}",
+            f"   - 攝影師: {self.task.photographer or '未設置'}",
+            
+            # 處理配置
+            "⚙️ 處理配置：",
+            f"   - 日誌級別: {self.processing.log_level}",
+            f"   - 並發任務數: {self.processing.max_concurrent_tasks}",
+            f"   - 超時時間: {self.processing.timeout_seconds}秒",
+            f"   - AI 最大 Token: {self.processing.ai_max_tokens}",
+            
+            "="*50,
+        ]))
     
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'Config':
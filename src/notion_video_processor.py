@@ -1,10 +1,21 @@
 # 增強版 src/notion_video_processor.py
 
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional, Any
+from dataclasses import asdict
+
 import cv2
 import numpy as np
 from PIL import Image
 import base64
 import io
+import structlog
+
+from .video_processor import NotionVideoProcessor
+
+logger = structlog.get_logger(__name__)
 
 class EnhancedNotionVideoProcessor(NotionVideoProcessor):
     """增強版影片處理器 - 新增 Whisper 和本地備份功能"""
@@ -31,26 +42,23 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
                 logger.warning("⚠️ 無法提取影片幀，使用預設時間點")
                 return None
             
-            # 轉換為 RGB 格式
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # 調整大小（可選）
-            height, width = frame_rgb.shape[:2]
+            # 調整大小（可選）；cv2 直接處理 BGR，不需轉換色彩空間
+            height, width = frame.shape[:2]
             if width > 1280:
                 ratio = 1280 / width
                 new_width = 1280
                 new_height = int(height * ratio)
-                frame_rgb = cv2.resize(frame_rgb, (new_width, new_height))
+                frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
             
             # 保存為文件
-            frame_path = os.path.join(self.temp_dir, f"{self.task.task_id}_frame.jpg")
-            cv2.imwrite(frame_path, cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR))
+            frame_path = str(self._temp_path / f"{self.task.task_id}_frame.jpg")
+            cv2.imwrite(frame_path, frame)
             
-            logger.info(f"✅ 提取影片幀成功: {frame_path}")
+            logger.info("✅ 提取影片幀成功", frame_path=frame_path)
             return frame_path
             
         except Exception as e:
-            logger.error(f"❌ 提取影片幀失敗: {e}")
+            logger.error("❌ 提取影片幀失敗", error=str(e))
             return None
     
     def _transcribe_with_whisper(self, video_path: str) -> Optional[Dict[str, Any]]:
@@ -77,13 +85,12 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
                 "segments": getattr(transcript, 'segments', [])
             }
             
-            logger.info(f"✅ 語音轉文字完成: {len(result['text'])} 字元")
-            logger.info(f"🗣️ 轉錄文字: {result['text'][:100]}...")
+            logger.info("✅ 語音轉文字完成", chars=len(result['text']), preview=result['text'][:100])
             
             return result
             
         except Exception as e:
-            logger.error(f"❌ 語音轉文字失敗: {e}")
+            logger.error("❌ 語音轉文字失敗", error=str(e))
             return None
     
     def _backup_to_downloads(self, video_path: str, thumbnail_path: Optional[str] = None) -> Dict[str, str]:
@@ -97,17 +104,17 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
             video_backup = self.downloads_dir / f"{self.task.task_id}_video{Path(video_path).suffix}"
             shutil.copy2(video_path, video_backup)
             backup_paths['video'] = str(video_backup)
-            logger.info(f"📁 影片備份完成: {video_backup}")
+            logger.info("📁 影片備份完成", path=str(video_backup))
             
             # 備份縮圖
             if thumbnail_path:
                 thumb_backup = self.downloads_dir / f"{self.task.task_id}_thumb{Path(thumbnail_path).suffix}"
                 shutil.copy2(thumbnail_path, thumb_backup)
                 backup_paths['thumbnail'] = str(thumb_backup)
-                logger.info(f"📁 縮圖備份完成: {thumb_backup}")
+                logger.info("📁 縮圖備份完成", path=str(thumb_backup))
                 
         except Exception as e:
-            logger.error(f"❌ 備份失敗: {e}")
+            logger.error("❌ 備份失敗", error=str(e))
             
         return backup_paths
     
@@ -175,7 +182,7 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
             logger.info("✅ 增強版 AI 內容生成成功")
             
         except Exception as e:
-            logger.error(f"❌ AI 內容生成失敗: {e}")
+            logger.error("❌ AI 內容生成失敗", error=str(e))
             # 設置基本的 fallback 內容
             self._set_fallback_content()
     
@@ -193,11 +200,9 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
     
     def process(self) -> Dict[str, Any]:
         """增強版處理流程"""
-        start_time = datetime.now()
+        start_mono = time.monotonic()
         logger.info("="*60)
-        logger.info(f"🚀 開始執行增強版影片處理流程")
-        logger.info(f"📋 任務 ID: {self.task.task_id}")
-        logger.info(f"🎬 任務名稱: {self.task.task_name}")
+        logger.info("🚀 開始執行增強版影片處理流程", task_name=self.task.task_name)
         logger.info("="*60)
         
         transcript_data = None
@@ -231,7 +236,7 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
                     if thumb_path:
                         self.task.processed_thumbnail_url = self._upload_to_r2(thumb_path, "thumbnails")
                 except Exception as e:
-                    logger.error(f"❌ R2 上傳失敗，使用本地備份: {e}")
+                    logger.error("❌ R2 上傳失敗，使用本地備份", error=str(e))
                     self.task.processed_video_url = f"local://{backup_paths.get('video', video_path)}"
                     if thumb_path:
                         self.task.processed_thumbnail_url = f"local://{backup_paths.get('thumbnail', thumb_path)}"
@@ -250,8 +255,7 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
             logger.info("🎉 增強版影片處理流程完全成功")
             
         except Exception as e:
-            logger.error("❌ 處理過程中發生錯誤")
-            logger.error(f"錯誤詳情: {str(e)}")
+            logger.error("❌ 處理過程中發生錯誤", error=str(e))
             
             self.task.status = "失敗"
             self.task.error_message = str(e)
@@ -261,8 +265,7 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
         
         finally:
             # 計算處理時間
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_mono
             
             # 清理臨時檔案（但保留 downloads）
             self._cleanup()
@@ -274,15 +277,12 @@ class EnhancedNotionVideoProcessor(NotionVideoProcessor):
             result['backup_paths'] = backup_paths
             result['processing_time'] = duration
             
-            logger.info("="*60)
-            logger.info("📊 增強版處理結果摘要")
-            logger.info("="*60)
-            logger.info(f"⏱️ 總處理時間: {duration:.1f} 秒")
-            logger.info(f"📄 任務 ID: {self.task.task_id}")
-            logger.info(f"✅ 最終狀態: {self.task.status}")
-            logger.info(f"📁 本地備份: {len(backup_paths)} 個檔案")
-            if transcript_data:
-                logger.info(f"🎤 轉錄文字: {len(transcript_data.get('text', ''))} 字元")
-            logger.info("="*60)
+            logger.info(
+                "📊 增強版處理結果摘要",
+                duration_s=round(duration, 1),
+                status=self.task.status,
+                backup_files=len(backup_paths),
+                transcript_chars=len(transcript_data.get('text', '')) if transcript_data else 0
+            )
             
             return result
\ No newline at end of file
@@ -3,19 +3,24 @@
 import os
 import sys
 import json
+import time
+import shutil
+import string
 import tempfile
-import hashlib
-from datetime import datetime
+import secrets
+import contextvars
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field, asdict
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
 
 import yt_dlp
 import boto3
 from openai import OpenAI
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 # --- 直接對應 Notion 欄位的資料結構 ---
 @dataclass
@@ -48,14 +53,50 @@ class NotionTask:
 
     def __post_init__(self):
         """在初始化後，生成唯一的 task_id"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hash_input = f"{self.original_link}_{timestamp}"
-        hash_suffix = hashlib.md5(hash_input.encode()).hexdigest()[:8]
-        self.task_id = f"task_{timestamp}_{hash_suffix}"
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # 隨機 8 碼後綴即可保證唯一，不需對連結做雜湊
+        self.task_id = f"task_{timestamp}_{secrets.token_hex(4)}"
 
 # --- 日誌設定 (保持不變) ---
 logger = structlog.get_logger(__name__)
 
+# --- R2 連線設定 (只建立一次) ---
+# 連線池需容納影片與縮圖同時上傳時 upload_file 的分段執行緒
+_R2_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+)
+
+# --- AI 回應格式 (strict JSON schema，保證回傳欄位完整) ---
+_AI_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "AI標題建議": {"type": "array", "items": {"type": "string"}},
+        "內容摘要": {"type": "string"},
+        "標籤建議": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["AI標題建議", "內容摘要", "標籤建議"],
+    "additionalProperties": False,
+}
+
+# --- AI 提示詞 (模組載入時建立一次) ---
+_AI_SYSTEM_PROMPT = "你是一位台灣短影音行銷專家，擅長創造吸引人的標題、摘要和標籤。"
+_AI_PROMPT_TEMPLATE = string.Template("""
+請分析以下影片任務，並以台灣社群媒體風格提供內容建議。
+任務名稱: $task_name
+
+請嚴格按照以下 JSON 格式回覆，不要有任何額外的文字或解釋：
+{
+  "AI標題建議": ["吸引人的標題1", "有趣的標題2", "病毒式標題3"],
+  "內容摘要": "一段約50-100字的影片內容摘要，要能引起觀看興趣。",
+  "標籤建議": ["#相關標籤1", "#熱門標籤2", "#台灣", "#fyp"]
+}
+""")
+
+def _submit(executor: ThreadPoolExecutor, fn, *args):
+    """在背景執行緒執行，並帶入目前的 structlog contextvars"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
 # --- 核心處理器 ---
 class NotionVideoProcessor:
     """
@@ -64,9 +105,14 @@ class NotionVideoProcessor:
     def __init__(self):
         """初始化，讀取環境變數並設定客戶端"""
         self.temp_dir = tempfile.mkdtemp(prefix='video_pipeline_')
+        self._temp_path = Path(self.temp_dir)
         self._setup_task_from_env()
-        self._setup_clients()
-        logger.info("Notion 影片處理器初始化完成", task_id=self.task.task_id, temp_dir=self.temp_dir)
+        self._setup_r2_from_env()
+        # yt-dlp 輸出樣板只組一次
+        self._output_tmpl = str(self._temp_path / f"{self.task.task_id}_video.%(ext)s")
+        # 綁定一次任務 ID，之後每筆日誌由 merge_contextvars 自動帶入
+        structlog.contextvars.bind_contextvars(task_id=self.task.task_id)
+        logger.info("Notion 影片處理器初始化完成", temp_dir=self.temp_dir)
 
     def _setup_task_from_env(self):
         """從環境變數讀取資訊，建立 NotionTask 物件"""
@@ -74,47 +120,76 @@ class NotionVideoProcessor:
             'NOTION_PAGE_ID', 'TASK_NAME', 'PERSON_IN_CHARGE',
             'VIDEOGRAPHER', 'ORIGINAL_LINK'
         ]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        env = {var: os.getenv(var) for var in required_vars}
+        missing_vars = [var for var, value in env.items() if not value]
         if missing_vars:
             raise ValueError(f"缺少必要的環境變數: {', '.join(missing_vars)}")
         
         self.task = NotionTask(
-            notion_page_id=os.getenv('NOTION_PAGE_ID'),
-            task_name=os.getenv('TASK_NAME'),
-            person_in_charge=os.getenv('PERSON_IN_CHARGE'),
-            videographer=os.getenv('VIDEOGRAPHER'),
-            original_link=os.getenv('ORIGINAL_LINK')
+            notion_page_id=env['NOTION_PAGE_ID'],
+            task_name=env['TASK_NAME'],
+            person_in_charge=env['PERSON_IN_CHARGE'],
+            videographer=env['VIDEOGRAPHER'],
+            original_link=env['ORIGINAL_LINK']
         )
         logger.info("任務資料載入成功", task_name=self.task.task_name)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _setup_clients(self):
-        """設定 OpenAI 和 R2 客戶端"""
-        self.openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=60.0)
-        self.r2_client = boto3.client(
+    def _setup_r2_from_env(self):
+        """讀取一次 R2 相關環境變數，並預先組好公開 URL 前綴"""
+        self.r2_account_id = os.getenv('R2_ACCOUNT_ID')
+        self.r2_bucket = os.getenv('R2_BUCKET')
+        # 工作流程在 secret 未設定時會匯出空字串，因此以 or 回退預設網域
+        r2_public_domain = os.getenv('R2_CUSTOM_DOMAIN') or f"pub-{self.r2_account_id}.r2.dev"
+        self._r2_url_prefix = f"https://{r2_public_domain}/"
+        # 同一任務的檔案放在同一個日期資料夾（跨午夜也不分開）
+        self._r2_date_folder = time.strftime("%Y/%m/%d")
+
+    @cached_property
+    def openai_client(self) -> OpenAI:
+        """OpenAI 客戶端，首次使用時才建立"""
+        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=60.0)
+        logger.info("OpenAI 客戶端設定完成")
+        return client
+
+    @cached_property
+    def r2_client(self):
+        """R2 客戶端，首次使用時才建立（延後載入 botocore 服務定義）"""
+        # 每次建立獨立 Session，避免多執行緒同時初始化預設 Session
+        client = boto3.session.Session().client(
             's3',
-            endpoint_url=f"https://{os.getenv('R2_ACCOUNT_ID')}.r2.cloudflarestorage.com",
+            endpoint_url=f"https://{self.r2_account_id}.r2.cloudflarestorage.com",
             aws_access_key_id=os.getenv('R2_ACCESS_KEY'),
             aws_secret_access_key=os.getenv('R2_SECRET_KEY'),
-            region_name='auto'
+            region_name='auto',
+            config=_R2_CLIENT_CONFIG
         )
-        logger.info("外部服務客戶端設定完成")
+        logger.info("R2 客戶端設定完成")
+        return client
 
     def _download_video(self) -> Tuple[str, Optional[str]]:
         """下載影片和縮圖，返回檔案路徑"""
         logger.info("開始下載影片", url=self.task.original_link)
-        output_path = os.path.join(self.temp_dir, f"{self.task.task_id}_video")
-        ydl_opts = {'format': 'best[height<=1080]/best', 'outtmpl': f'{output_path}.%(ext)s', 'writethumbnail': True}
+        ydl_opts = {
+            'format': 'best[height<=1080]/best',
+            'outtmpl': self._output_tmpl,
+            'writethumbnail': True,
+            'noplaylist': True,                 # 只下載單一影片，不展開播放清單
+            'concurrent_fragment_downloads': 8, # HLS/DASH 分段並行下載
+            'retries': 3,
+        }
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([self.task.original_link])
+            info = ydl.extract_info(self.task.original_link, download=True)
         
-        # 尋找下載的檔案
-        video_files = list(Path(self.temp_dir).glob(f"{self.task.task_id}_video.*"))
-        video_file = next((str(f) for f in video_files if f.suffix not in ['.webp', '.jpg', '.png']), None)
-        thumbnail_file = next((str(f) for f in video_files if f.suffix in ['.webp', '.jpg', '.png']), None)
+        # 直接使用 yt-dlp 回報的檔案路徑，不再掃描暫存資料夾
+        downloads = info.get('requested_downloads') or []
+        video_file = downloads[0].get('filepath') if downloads else None
+        thumbnail_file = next(
+            (t['filepath'] for t in reversed(info.get('thumbnails') or []) if t.get('filepath')),
+            None
+        )
         
-        if not video_file:
+        if not video_file or not os.path.exists(video_file):
             raise FileNotFoundError("影片下載失敗或找不到檔案")
         
         logger.info("影片下載完成", video_file=Path(video_file).name)
@@ -122,45 +197,41 @@ class NotionVideoProcessor:
 
     def _upload_to_r2(self, local_path: str, file_type: str) -> str:
         """上傳單一檔案到 R2，返回公開 URL"""
-        bucket = os.getenv('R2_BUCKET')
-        timestamp_path = datetime.now().strftime("%Y/%m/%d")
-        r2_key = f"{file_type}/{timestamp_path}/{self.task.task_id}{Path(local_path).suffix}"
+        r2_key = f"{file_type}/{self._r2_date_folder}/{self.task.task_id}{Path(local_path).suffix}"
         
         content_type_map = {'.mp4': 'video/mp4', '.jpg': 'image/jpeg', '.png': 'image/png', '.webp': 'image/webp'}
         content_type = content_type_map.get(Path(local_path).suffix, 'application/octet-stream')
         
-        self.r2_client.upload_file(local_path, bucket, r2_key, ExtraArgs={'ContentType': content_type})
+        self.r2_client.upload_file(local_path, self.r2_bucket, r2_key, ExtraArgs={'ContentType': content_type})
         
         # 組成公開 URL
-        r2_public_domain = os.getenv('R2_CUSTOM_DOMAIN', f"pub-{os.getenv('R2_ACCOUNT_ID')}.r2.dev")
-        url = f"https://{r2_public_domain}/{r2_key}"
-        logger.info(f"{file_type} 上傳完成", url=url)
+        url = self._r2_url_prefix + r2_key
+        logger.info("檔案上傳完成", file_type=file_type, url=url)
         return url
 
     def _generate_ai_content(self):
         """呼叫 AI 生成內容，並更新 task 物件"""
         logger.info("開始生成 AI 內容")
-        prompt = f"""
-        請分析以下影片任務，並以台灣社群媒體風格提供內容建議。
-        任務名稱: {self.task.task_name}
-        
-        請嚴格按照以下 JSON 格式回覆，不要有任何額外的文字或解釋：
-        {{
-          "AI標題建議": ["吸引人的標題1", "有趣的標題2", "病毒式標題3"],
-          "內容摘要": "一段約50-100字的影片內容摘要，要能引起觀看興趣。",
-          "標籤建議": ["#相關標籤1", "#熱門標籤2", "#台灣", "#fyp"]
-        }}
-        """
+        prompt = _AI_PROMPT_TEMPLATE.substitute(task_name=self.task.task_name)
         response = self.openai_client.chat.completions.create(
             model="gpt-4o-mini",
-            response_format={"type": "json_object"},
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "short_video_content", "strict": True, "schema": _AI_RESPONSE_SCHEMA}
+            },
             messages=[
-                {"role": "system", "content": "你是一位台灣短影音行銷專家，擅長創造吸引人的標題、摘要和標籤。"},
+                {"role": "system", "content": _AI_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ]
         )
+        message = response.choices[0].message
+        # strict schema 下模型拒答時 content 為 None，說明放在 refusal
+        if message.refusal or message.content is None:
+            logger.error("AI 拒絕回應或無內容", refusal=message.refusal)
+            self.task.error_message = "AI 拒絕回應或未回傳內容"
+            return
         try:
-            ai_data = json.loads(response.choices[0].message.content)
+            ai_data = json.loads(message.content)
             self.task.ai_title_suggestions = ai_data.get("AI標題建議", [])
             self.task.ai_content_summary = ai_data.get("內容摘要", "")
             self.task.ai_tag_suggestions = ai_data.get("標籤建議", [])
@@ -171,23 +242,28 @@ class NotionVideoProcessor:
 
     def _cleanup(self):
         """清理臨時資料夾"""
-        import shutil
         shutil.rmtree(self.temp_dir)
         logger.info("臨時檔案清理完成")
 
     def process(self) -> Dict[str, Any]:
         """執行完整的處理流程"""
         try:
-            # 1. 下載
+            # 1. 下載（先完成下載再呼叫 AI：下載失敗時不產生 OpenAI 費用，也不需等待 AI 回應）
             video_path, thumb_path = self._download_video()
-            
-            # 2. 上傳
-            self.task.processed_video_url = self._upload_to_r2(video_path, "videos")
-            if thumb_path:
-                self.task.processed_thumbnail_url = self._upload_to_r2(thumb_path, "thumbnails")
-            
-            # 3. AI 分析
-            self._generate_ai_content()
+
+            # AI 分析只依賴任務名稱，與上傳並行執行
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                ai_future = _submit(executor, self._generate_ai_content)
+                
+                # 2. 上傳（影片與縮圖同時上傳）
+                video_future = _submit(executor, self._upload_to_r2, video_path, "videos")
+                thumb_future = _submit(executor, self._upload_to_r2, thumb_path, "thumbnails") if thumb_path else None
+                self.task.processed_video_url = video_future.result()
+                if thumb_future:
+                    self.task.processed_thumbnail_url = thumb_future.result()
+                
+                # 3. 等待 AI 分析完成
+                ai_future.result()
             
             # 4. 更新最終狀態
             if not self.task.error_message: # 如果AI步驟沒有出錯